@@ -4,8 +4,11 @@ __author__ = 'Olga Botvinnik'
 __email__ = 'olga.botvinnik@gmail.com'
 __version__ = '1.0.0'
 
+from .store import WaypointsStore
+from .summary import voyage_summary, waypoint_summary
 from .voyages import Voyages
 from .visualize import waypointplot
 from .waypoints import Waypoints
 
-__all__ = ['Waypoints', 'Voyages', 'direction', 'waypointplot']
+__all__ = ['Waypoints', 'Voyages', 'WaypointsStore', 'direction',
+           'waypointplot', 'waypoint_summary', 'voyage_summary']
@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+import binascii
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+
+class WaypointsStore(object):
+    """On-disk waypoints, partitioned into one file per group
+
+    Every group is stored as a (features, 2) numpy array of the x- and y-
+    positions, aligned to the same feature index (missing features are NaN).
+    Partitions are read as memory maps, so only the rows that are used are
+    loaded into memory. Each partition is named after its group, so different
+    groups can be written in parallel, e.g. by one job per phenotype, once
+    the store has been created.
+
+    Parameters
+    ----------
+    path : str
+        Folder of an existing store, e.g. created by WaypointsStore.create()
+        or WaypointsStore.from_waypoints()
+    """
+
+    features_json = 'features.json'
+    groups_folder = 'groups'
+
+    def __init__(self, path):
+        self.path = path
+        # JSON, so the feature ids keep their types, e.g. '001' stays a string
+        with open(os.path.join(path, self.features_json)) as f:
+            features = json.load(f)
+        self.features = pd.Index(features, name='feature_id')
+
+    @classmethod
+    def create(cls, path, features):
+        """Create an empty store for waypoints of these features
+
+        Parameters
+        ----------
+        path : str
+            Folder to create the store in
+        features : list-like
+            Feature ids that the waypoints of every group are aligned to
+
+        Returns
+        -------
+        store : WaypointsStore
+            The empty store, or the existing store in this folder if it has
+            exactly the same features
+
+        Raises
+        ------
+        ValueError
+            If the folder already contains a store with different features,
+            whose partitions would no longer be aligned to the features
+        """
+        features = pd.Index(features).tolist()
+        features_json = os.path.join(path, cls.features_json)
+        groups_folder = os.path.join(path, cls.groups_folder)
+
+        if os.path.exists(features_json):
+            existing = cls(path)
+            if existing.features.tolist() != features:
+                raise ValueError(
+                    '{} already contains a store with different '
+                    'features'.format(path))
+            return existing
+        if os.path.exists(groups_folder) and os.listdir(groups_folder):
+            raise ValueError(
+                '{} already contains partitions of groups'.format(path))
+
+        if not os.path.exists(groups_folder):
+            os.makedirs(groups_folder)
+        with open(features_json, 'w') as f:
+            json.dump(features, f)
+        return cls(path)
+
+    @classmethod
+    def from_waypoints(cls, path, waypoints):
+        """Partition in-memory waypoints into a store, one group at a time
+
+        Parameters
+        ----------
+        path : str
+            Folder to create the store in
+        waypoints : pandas.DataFrame
+            A ((group, features), 2) multiindexed dataframe, exactly the input
+            to Voyages.voyages()
+
+        Returns
+        -------
+        store : WaypointsStore
+            The store containing all groups of the waypoints
+        """
+        features = waypoints.index.get_level_values(1).unique()
+        store = cls.create(path, features)
+        for group in waypoints.index.get_level_values(0).unique():
+            store.write(group, waypoints.xs(group, level=0))
+        return store
+
+    @property
+    def groups(self):
+        """Names of all groups written to the store so far"""
+        folder = os.path.join(self.path, self.groups_folder)
+        return sorted(
+            binascii.unhexlify(filename[:-len('.npy')]).decode('utf-8')
+            for filename in os.listdir(folder) if filename.endswith('.npy'))
+
+    def _partition(self, group):
+        """Filename of a group, hex-encoded so any name is a valid filename"""
+        name = binascii.hexlify(str(group).encode('utf-8')).decode('ascii')
+        return os.path.join(self.path, self.groups_folder, name + '.npy')
+
+    def write(self, group, waypoints):
+        """Add (or replace) the waypoints of a single group
+
+        Parameters
+        ----------
+        group : str
+            Name of the group, as used in the transitions
+        waypoints : pandas.DataFrame
+            A (features, 2) dataframe of x- and y- positions, e.g. the output
+            from Waypoints.transform(). Features not in the store are ignored.
+        """
+        filename = self._partition(group)
+        aligned = waypoints.iloc[:, :2].reindex(self.features)
+
+        # Write to a temporary file first, so readers never see a partially
+        # written partition
+        temporary = '{}.{}.tmp'.format(filename, os.getpid())
+        with open(temporary, 'wb') as f:
+            np.save(f, aligned.values.astype(float))
+        getattr(os, 'replace', os.rename)(temporary, filename)
+
+    def read(self, group):
+        """Memory-map the (features, 2) array of waypoints of a group
+
+        Raises
+        ------
+        KeyError
+            If the group has not been written to the store
+        ValueError
+            If the partition is not aligned to the features of the store
+        """
+        filename = self._partition(group)
+        if not os.path.exists(filename):
+            raise KeyError('Group "{}" is not in the store'.format(group))
+
+        waypoints = np.load(filename, mmap_mode='r')
+        if waypoints.shape != (len(self.features), 2):
+            raise ValueError(
+                'Waypoints of group "{}" have shape {}, but the store has '
+                '{} features'.format(group, waypoints.shape,
+                                     len(self.features)))
+        return waypoints
+
+    def blocks(self, group1, group2, chunksize=10000):
+        """Iterate over aligned blocks of features from two groups
+
+        Parameters
+        ----------
+        group1, group2 : str
+            Names of the groups
+        chunksize : int, optional
+            Maximum number of features in each block
+
+        Yields
+        ------
+        features : pandas.Index
+            Feature ids of this block
+        block1, block2 : numpy.array
+            (chunksize, 2) arrays of the waypoints of each group
+        """
+        waypoints1 = self.read(group1)
+        waypoints2 = self.read(group2)
+        for start in range(0, len(self.features), chunksize):
+            stop = start + chunksize
+            yield (self.features[start:stop],
+                   np.asarray(waypoints1[start:stop]),
+                   np.asarray(waypoints2[start:stop]))
@@ -0,0 +1,242 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+import pandas as pd
+
+from .voyages import DIRECTIONS, direction_codes
+
+
+QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+
+
+def _is_key(data, key):
+    """Whether this is a grouping key, rather than the label of one row"""
+    if isinstance(key, (pd.Series, pd.Index, np.ndarray, list)):
+        return True
+    try:
+        return key in data.columns or key in data.index.names
+    except TypeError:
+        # Unhashable, so can't be a column name
+        return False
+
+
+def _keys(data, by, series_index=None):
+    """Get the grouping keys as a list of (name, array) pairs"""
+    if isinstance(by, (list, tuple)):
+        if all(_is_key(data, key) for key in by):
+            by = list(by)
+        elif len(by) == len(data):
+            # Like pandas groupby, a list of labels of each row is one key
+            by = [np.asarray(by)]
+        else:
+            missing = [key for key in by if not _is_key(data, key)]
+            raise KeyError('{} are not columns or index levels, and there '
+                           'are not as many labels as rows'.format(missing))
+    else:
+        by = [by]
+
+    keys = []
+    for key in by:
+        if isinstance(key, pd.Series):
+            if series_index is None:
+                values = key.reindex(data.index).values
+            else:
+                values = key.reindex(series_index).values
+            keys.append((key.name, values))
+        elif np.ndim(key) == 0 and key in data.columns:
+            keys.append((key, data[key].values))
+        elif np.ndim(key) == 0 and key in data.index.names:
+            keys.append((key, data.index.get_level_values(key).values))
+        elif np.ndim(key) == 0:
+            raise KeyError('{} is not a column or index level'.format(key))
+        else:
+            keys.append((None, np.asarray(key)))
+    return keys
+
+
+def _encode(keys, mask):
+    """Integer-code the observed combinations of the grouping keys
+
+    Parameters
+    ----------
+    keys : list of (name, numpy.array) pairs
+        The labels of each row, for each grouping key
+    mask : numpy.array
+        Boolean array of which rows to use
+
+    Returns
+    -------
+    codes : numpy.array
+        Group code for each row, or -1 for rows that are masked out or have a
+        missing label
+    index : pandas.Index
+        The labels of each group code, a MultiIndex if there are multiple keys
+    """
+    codes = np.where(mask, 0, -1).astype(np.int64)
+    levels = []
+    for name, values in keys:
+        level_codes, uniques = pd.factorize(values, sort=True)
+        codes = np.where((codes < 0) | (level_codes < 0), -1,
+                         codes * len(uniques) + level_codes)
+        levels.append(np.asarray(uniques))
+
+    valid = codes >= 0
+    observed, inverse = np.unique(codes[valid], return_inverse=True)
+    codes[valid] = inverse
+
+    # Unravel the combined codes back into the labels of each key
+    labels = []
+    for uniques in levels[::-1]:
+        observed, level_codes = np.divmod(observed, len(uniques))
+        labels.append(uniques[level_codes])
+    labels = labels[::-1]
+
+    names = [name for name, values in keys]
+    if len(labels) == 1:
+        index = pd.Index(labels[0], name=names[0])
+    else:
+        index = pd.MultiIndex.from_arrays(labels, names=names)
+    return codes, index
+
+
+def _summarize(x, y, codes, n_groups, n_std=2, prefixes=('x', 'y')):
+    """Count, centroid, covariance and ellipse of each group of 2d points"""
+    valid = codes >= 0
+    x, y, codes = x[valid], y[valid], codes[valid]
+
+    count = np.bincount(codes, minlength=n_groups)
+    x_mean = np.bincount(codes, weights=x, minlength=n_groups) / count
+    y_mean = np.bincount(codes, weights=y, minlength=n_groups) / count
+
+    # Center before squaring, which is more stable than the sum of squares
+    x_centered = x - x_mean[codes]
+    y_centered = y - y_mean[codes]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ddof = np.where(count > 1, count - 1, np.nan)
+        xx = np.bincount(codes, weights=x_centered * x_centered,
+                         minlength=n_groups) / ddof
+        yy = np.bincount(codes, weights=y_centered * y_centered,
+                         minlength=n_groups) / ddof
+        xy = np.bincount(codes, weights=x_centered * y_centered,
+                         minlength=n_groups) / ddof
+
+    # Closed-form eigendecomposition of each 2x2 covariance matrix
+    half_trace = (xx + yy) / 2
+    root = np.sqrt(((xx - yy) / 2) ** 2 + xy ** 2)
+    major = half_trace + root
+    minor = np.maximum(half_trace - root, 0)
+
+    x_name, y_name = prefixes
+    return [('count', count),
+            ('{}_mean'.format(x_name), x_mean),
+            ('{}_mean'.format(y_name), y_mean),
+            ('{}_var'.format(x_name), xx),
+            ('{}_var'.format(y_name), yy),
+            ('{}{}_cov'.format(x_name, y_name), xy),
+            ('ellipse_width', 2 * n_std * np.sqrt(major)),
+            ('ellipse_height', 2 * n_std * np.sqrt(minor)),
+            ('ellipse_angle', np.degrees(np.arctan2(2 * xy, xx - yy) / 2))]
+
+
+def _grouped_quantiles(values, codes, n_groups, quantiles):
+    """Linearly interpolated quantiles of values within each group"""
+    valid = codes >= 0
+    values, codes = values[valid], codes[valid]
+
+    # Sort by group, then by value, so each group is one contiguous run
+    order = np.lexsort((values, codes))
+    values = values[order]
+    count = np.bincount(codes, minlength=n_groups)
+    starts = np.cumsum(count) - count
+
+    position = starts[:, np.newaxis] \
+        + np.asarray(quantiles)[np.newaxis, :] * (count[:, np.newaxis] - 1)
+    lower = np.floor(position).astype(int)
+    upper = np.ceil(position).astype(int)
+    fraction = position - lower
+    return values[lower] + (values[upper] - values[lower]) * fraction
+
+
+def waypoint_summary(waypoints, by, n_std=2):
+    """Summarize the waypoints of each group, e.g. each modality
+
+    Parameters
+    ----------
+    waypoints : pandas.DataFrame
+        A (features, 2) dataframe of x- and y- positions, e.g. the output from
+        Waypoints.transform()
+    by : str, pandas.Series, array-like or list of those
+        How to group the features, in the same way as ``features_groupby`` in
+        waypointplot(). Strings are taken as column names or index level
+        names, Series are aligned on the index of the waypoints, and other
+        array-likes are taken as the label of each feature
+    n_std : int or float, optional
+        Number of standard deviations that the covariance ellipse spans
+
+    Returns
+    -------
+    summary : pandas.DataFrame
+        A (groups, statistics) dataframe with the number of features, the
+        centroid, the covariance, and the width, height and angle (in degrees)
+        of the covariance ellipse of each group
+    """
+    x = waypoints.iloc[:, 0].values.astype(float)
+    y = waypoints.iloc[:, 1].values.astype(float)
+    mask = np.isfinite(x) & np.isfinite(y)
+
+    codes, index = _encode(_keys(waypoints, by), mask)
+    columns = _summarize(x, y, codes, len(index), n_std=n_std)
+
+    return pd.DataFrame(dict(columns), index=index,
+                        columns=[name for name, values in columns])
+
+
+def voyage_summary(voyages, by='transition', quantiles=QUANTILES, n_std=2):
+    """Summarize the voyages of each transition, and optionally each modality
+
+    Parameters
+    ----------
+    voyages : pandas.DataFrame
+        Exactly the output from Voyages.voyages()
+    by : str, pandas.Series, array-like or list of those, optional
+        How to group the voyages. Strings are taken as column names, Series
+        (e.g. the modality of each feature) are aligned on the "event_id"
+        column, and other array-likes are taken as the label of each voyage
+    quantiles : list of float, optional
+        Which quantiles of the magnitude to calculate
+    n_std : int or float, optional
+        Number of standard deviations that the covariance ellipse spans
+
+    Returns
+    -------
+    summary : pandas.DataFrame
+        A (groups, statistics) dataframe with the number of voyages, the
+        centroid and covariance of the changes in x and y, the width, height
+        and angle (in degrees) of the covariance ellipse, the number of
+        voyages in each direction, and the quantiles of the magnitude
+    """
+    dx = voyages[r'$\Delta x$'].values.astype(float)
+    dy = voyages[r'$\Delta y$'].values.astype(float)
+    magnitude = voyages['magnitude'].values.astype(float)
+    mask = np.isfinite(dx) & np.isfinite(dy) & np.isfinite(magnitude)
+
+    series_index = voyages['event_id'] if 'event_id' in voyages else None
+    codes, index = _encode(_keys(voyages, by, series_index), mask)
+    n_groups = len(index)
+    columns = _summarize(dx, dy, codes, n_groups, n_std=n_std,
+                         prefixes=('dx', 'dy'))
+
+    # Histogram of directions as a single bincount over (group, direction)
+    directions = direction_codes(dx, dy)
+    moving = (codes >= 0) & (directions >= 0)
+    histogram = np.bincount(
+        codes[moving] * len(DIRECTIONS) + directions[moving],
+        minlength=n_groups * len(DIRECTIONS))
+    histogram = histogram.reshape(n_groups, len(DIRECTIONS))
+    columns.extend(zip(DIRECTIONS, histogram.T))
+
+    magnitudes = _grouped_quantiles(magnitude, codes, n_groups, quantiles)
+    columns.extend(('magnitude_{:g}'.format(q), magnitudes[:, i])
+                   for i, q in enumerate(quantiles))
+
+    return pd.DataFrame(dict(columns), index=index,
+                        columns=[name for name, values in columns])
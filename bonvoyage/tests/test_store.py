@@ -0,0 +1,135 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pandas.util.testing as pdt
+import pytest
+
+
+@pytest.fixture
+def grouped_waypoints(waypoints):
+    # Three phenotypes: the waypoints, the waypoints in reverse order, and
+    # half of the waypoints with the first feature missing
+    groups = {'A': waypoints,
+              'B': waypoints.iloc[::-1].set_index(waypoints.index),
+              'C': waypoints.iloc[1:] / 2}
+    grouped = pd.concat(groups)
+    # Integer columns, like the output from Waypoints.transform()
+    grouped.columns = [0, 1]
+    return grouped
+
+
+@pytest.fixture
+def store(grouped_waypoints, tmpdir):
+    from bonvoyage import WaypointsStore
+
+    return WaypointsStore.from_waypoints(str(tmpdir.join('store')),
+                                         grouped_waypoints)
+
+
+def test_from_waypoints(store, grouped_waypoints):
+    from bonvoyage import WaypointsStore
+
+    reopened = WaypointsStore(store.path)
+    assert reopened.groups == ['A', 'B', 'C']
+
+    for group in reopened.groups:
+        true = grouped_waypoints.loc[group].reindex(reopened.features)
+        pdt.assert_almost_equal(np.asarray(reopened.read(group)),
+                                true.values)
+
+
+def test_voyages_from_store(store, grouped_waypoints, tmpdir):
+    from bonvoyage import Voyages
+
+    transitions = [('A', 'B'), ('B', 'C')]
+    output = str(tmpdir.join('voyages.csv'))
+    v = Voyages()
+
+    v.voyages_from_store(store, transitions, output, chunksize=7)
+    test = pd.read_csv(output)
+    true = v.voyages(grouped_waypoints, transitions)
+
+    assert os.path.exists(output)
+    assert test.shape[0] == true.shape[0]
+    test = test.sort_values(['transition', 'event_id'])
+    true = true.sort_values(['transition', 'event_id'])
+    for column in ['event_id', r'$\Delta x$', r'$\Delta y$', 'magnitude']:
+        pdt.assert_almost_equal(test[column].values, true[column].values)
+    assert (test['direction'].fillna('') ==
+            true['direction'].fillna('')).all()
+
+
+def test_string_features(waypoints, tmpdir):
+    from bonvoyage import WaypointsStore
+
+    # Ids that would be parsed as numbers or missing values from a csv
+    features = ['{:03d}'.format(i) for i in range(waypoints.shape[0] - 2)]
+    features += ['NA', 'null']
+    waypoints = waypoints.set_index(pd.Index(features))
+
+    path = str(tmpdir.join('store'))
+    WaypointsStore.create(path, features).write('A', waypoints)
+    store = WaypointsStore(path)
+
+    assert list(store.features) == features
+    pdt.assert_almost_equal(np.asarray(store.read('A')), waypoints.values)
+
+
+def test_write_from_separate_stores(waypoints, tmpdir):
+    from bonvoyage import WaypointsStore
+
+    # Like parallel jobs that each open the store and write one group
+    path = str(tmpdir.join('store'))
+    WaypointsStore.create(path, waypoints.index)
+    WaypointsStore(path).write('A', waypoints)
+    WaypointsStore(path).write('B', waypoints / 2)
+    store = WaypointsStore(path)
+
+    assert store.groups == ['A', 'B']
+    pdt.assert_almost_equal(np.asarray(store.read('A')), waypoints.values)
+    pdt.assert_almost_equal(np.asarray(store.read('B')),
+                            waypoints.values / 2)
+
+
+def test_non_ascii_group(waypoints, tmpdir):
+    from bonvoyage import WaypointsStore
+
+    store = WaypointsStore.create(str(tmpdir.join('store')), waypoints.index)
+    store.write(u'\u00e9tape 1/2', waypoints)
+
+    assert store.groups == [u'\u00e9tape 1/2']
+    pdt.assert_almost_equal(np.asarray(store.read(u'\u00e9tape 1/2')),
+                            waypoints.values)
+
+
+def test_create_existing(store, grouped_waypoints):
+    from bonvoyage import WaypointsStore
+
+    # Same features keeps the existing partitions
+    features = grouped_waypoints.index.get_level_values(1).unique()
+    reopened = WaypointsStore.create(store.path, features)
+    assert reopened.groups == ['A', 'B', 'C']
+
+    # Different features would misalign the existing partitions
+    with pytest.raises(ValueError):
+        WaypointsStore.create(store.path, features[::-1])
+
+
+def test_read_misaligned(store):
+    # A partition written for a different set of features
+    np.save(store._partition('A'), np.zeros((3, 2)))
+
+    with pytest.raises(ValueError):
+        store.read('A')
+
+
+def test_voyages_from_store_missing_group(store, tmpdir):
+    from bonvoyage import Voyages
+
+    output = str(tmpdir.join('voyages.csv'))
+    with pytest.raises(KeyError) as error:
+        Voyages().voyages_from_store(store, [('A', 'D')], output)
+
+    assert 'D' in str(error.value)
+    assert not os.path.exists(output)
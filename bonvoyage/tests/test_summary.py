@@ -0,0 +1,105 @@
+import numpy as np
+import pandas as pd
+import pandas.util.testing as pdt
+import pytest
+
+
+@pytest.fixture
+def modalities(waypoints):
+    labels = ['bimodal', 'excluded', 'included']
+    return pd.Series(np.resize(labels, waypoints.shape[0]),
+                     index=waypoints.index, name='modality')
+
+
+@pytest.fixture
+def voyages(waypoints):
+    # Random changes of every feature in two transitions, one with no movement
+    n = waypoints.shape[0]
+    delta = np.random.RandomState(0).uniform(-0.5, 0.5, size=(2 * n, 2))
+    delta[0] = 0
+    voyages = pd.DataFrame(delta, columns=[r'$\Delta x$', r'$\Delta y$'])
+    voyages['event_id'] = np.tile(waypoints.index, 2)
+    voyages['magnitude'] = np.linalg.norm(delta, axis=1)
+    voyages['transition'] = np.repeat(['A-B', 'B-C'], n)
+    return voyages
+
+
+def test_waypoint_summary(waypoints, modalities):
+    from bonvoyage import waypoint_summary
+
+    test = waypoint_summary(waypoints, modalities)
+
+    for modality, df in waypoints.groupby(modalities):
+        assert test.loc[modality, 'count'] == df.shape[0]
+        pdt.assert_almost_equal(
+            test.loc[modality, ['x_mean', 'y_mean']].values,
+            df.mean().values)
+        covariance = df.cov().values
+        pdt.assert_almost_equal(
+            test.loc[modality, ['x_var', 'y_var', 'xy_cov']].values,
+            np.array([covariance[0, 0], covariance[1, 1],
+                      covariance[0, 1]]))
+        (minor, major), vectors = np.linalg.eigh(covariance)
+        pdt.assert_almost_equal(test.loc[modality, 'ellipse_width'],
+                                4 * np.sqrt(major))
+        pdt.assert_almost_equal(test.loc[modality, 'ellipse_height'],
+                                4 * np.sqrt(max(minor, 0)))
+        # The major axis is only defined up to its sign
+        angle = np.degrees(np.arctan2(vectors[1, 1], vectors[0, 1]))
+        difference = np.radians(test.loc[modality, 'ellipse_angle'] - angle)
+        pdt.assert_almost_equal(np.sin(difference), 0.0)
+
+
+def test_waypoint_summary_labels(waypoints, modalities):
+    from bonvoyage import waypoint_summary
+
+    # A plain list of labels, like features_groupby in waypointplot()
+    true = waypoint_summary(waypoints, modalities)
+    test = waypoint_summary(waypoints, list(modalities))
+
+    pdt.assert_almost_equal(test.values, true.values)
+    assert list(test.index) == list(true.index)
+
+
+def test_voyage_summary(voyages):
+    from bonvoyage import Voyages, voyage_summary
+    from bonvoyage.voyages import DIRECTIONS
+
+    quantiles = (0.25, 0.5, 0.75)
+    test = voyage_summary(voyages, quantiles=quantiles)
+    directions = voyages.apply(Voyages.direction, axis=1)
+
+    for transition, df in voyages.groupby('transition'):
+        assert test.loc[transition, 'count'] == df.shape[0]
+        counts = directions[df.index].value_counts()
+        for direction in DIRECTIONS:
+            assert test.loc[transition, direction] == counts.get(direction, 0)
+        pdt.assert_almost_equal(
+            test.loc[transition, ['magnitude_0.25', 'magnitude_0.5',
+                                  'magnitude_0.75']].values.astype(float),
+            df['magnitude'].quantile(quantiles).values)
+
+
+def test_voyage_summary_multiple_keys(voyages, modalities):
+    from bonvoyage import voyage_summary
+
+    test = voyage_summary(voyages, by=['transition', modalities])
+    modality_of_event = voyages['event_id'].map(modalities)
+    grouped = voyages.groupby(['transition', modality_of_event])
+
+    assert list(test.index) == list(grouped.groups)
+    assert test.index.names == ['transition', 'modality']
+    for (transition, modality), df in grouped:
+        deltas = df[[r'$\Delta x$', r'$\Delta y$']]
+        row = test.loc[(transition, modality)]
+        assert row['count'] == df.shape[0]
+        pdt.assert_almost_equal(
+            row[['dx_mean', 'dy_mean']].values.astype(float),
+            deltas.mean().values)
+        covariance = deltas.cov().values
+        pdt.assert_almost_equal(
+            row[['dx_var', 'dy_var', 'dxdy_cov']].values.astype(float),
+            np.array([covariance[0, 0], covariance[1, 1],
+                      covariance[0, 1]]))
+        pdt.assert_almost_equal(
+            row['magnitude_0.5'], df['magnitude'].median())
@@ -5,6 +5,46 @@ import pandas as pd
 VOYAGE_COLUMNS = ['group1', 'group2', 'magnitude', '$\Delta x$',
                   '$\Delta y$ ', 'direction']
 
+# Directions of change in the order of the codes from direction_codes()
+DIRECTIONS = [r'$\nearrow$', r'$\searrow$', r'$\nwarrow$', r'$\swarrow$']
+
+
+def direction_codes(dx, dy):
+    """Integer-code the direction of change based on delta x and delta y
+
+    Parameters
+    ----------
+    dx, dy : numpy.array
+        1-D arrays of the change in x and y
+
+    Returns
+    -------
+    codes : numpy.array
+        Integer index into DIRECTIONS for each change, or -1 where there was
+        no movement (or the change is not a number)
+    """
+    dx = np.asarray(dx, dtype=float)
+    dy = np.asarray(dy, dtype=float)
+    codes = np.full(dx.shape, -1, dtype=int)
+    # Towards upper right --> bimodal
+    codes[(dx > 0) & (dy > 0)] = 0
+    # Towards lower right --> ~0
+    codes[(dx > 0) & (dy <= 0)] = 1
+    # Towards upper left --> ~1
+    codes[(dx <= 0) & (dy > 0)] = 2
+    # Towards origin/lower left --> middle
+    codes[(dx <= 0) & (dy <= 0)] = 3
+    # No movement --> Not a number
+    codes[(dx == 0) & (dy == 0)] = -1
+    return codes
+
+
+def direction_labels(dx, dy):
+    """Vectorized Voyages.direction, LaTeX arrows or NaN for no movement"""
+    # Code -1 (no movement) wraps around to NaN
+    labels = np.array(DIRECTIONS + [np.nan], dtype=object)
+    return labels[direction_codes(dx, dy)]
+
 
 class Voyages(object):
 
@@ -55,12 +95,80 @@ class Voyages(object):
         distances = distances.rename(columns={0: '$\Delta x$',
                                               1: '$\Delta y$',
                                               'index': 'event_id'})
-        distances['direction'] = distances.apply(self.direction, axis=1)
+        distances['direction'] = direction_labels(distances['$\Delta x$'],
+                                                  distances['$\Delta y$'])
         distances['transition'] = distances['group1'] + '-' \
             + distances['group2']
 
         return distances
 
+    def voyages_from_store(self, store, transitions, output,
+                           chunksize=10000):
+        """Find voyages between groups of waypoints stored on disk
+
+        Unlike voyages(), only two blocks of ``chunksize`` features are in
+        memory at once, and the voyages are appended to ``output`` as they are
+        calculated.
+
+        Parameters
+        ----------
+        store : WaypointsStore
+            Waypoints partitioned by the groups labeled in the transitions
+        transitions : list of str pairs
+            Which phenotype follows from one to the next, for calculating
+            voyages between features
+        output : str
+            Filename of the csv to write the voyages to, with the same columns
+            as the output from voyages()
+        chunksize : int, optional
+            Number of features to read from each group at a time
+
+        Returns
+        -------
+        output : str
+            Filename of the csv of voyages
+
+        Raises
+        ------
+        KeyError
+            If a group in the transitions is not in the store
+        """
+        # Check before writing anything, rather than leaving a partial csv
+        groups = set(store.groups)
+        for transition in transitions:
+            for group in transition:
+                if group not in groups:
+                    raise KeyError(
+                        'Group "{}" is not in the store'.format(group))
+
+        columns = ['event_id', r'$\Delta x$', r'$\Delta y$', 'magnitude',
+                   'group1', 'group2', 'direction', 'transition']
+        pd.DataFrame(columns=columns).to_csv(output, index=False)
+
+        for group1, group2 in transitions:
+            blocks = store.blocks(group1, group2, chunksize=chunksize)
+            for features, block1, block2 in blocks:
+                delta = block2 - block1
+                rows = np.isfinite(delta).all(axis=1)
+                if not rows.any():
+                    continue
+                delta = delta[rows]
+
+                distances = pd.DataFrame(
+                    {'event_id': features[rows],
+                     r'$\Delta x$': delta[:, 0],
+                     r'$\Delta y$': delta[:, 1],
+                     'magnitude': np.linalg.norm(delta, axis=1)},
+                    columns=columns)
+                distances['group1'] = group1
+                distances['group2'] = group2
+                distances['direction'] = direction_labels(delta[:, 0],
+                                                          delta[:, 1])
+                distances['transition'] = group1 + '-' + group2
+                distances.to_csv(output, mode='a', header=False, index=False)
+
+        return output
+
     @staticmethod
     def direction(row):
         """Assign orientation of change based on delta x and delta y
@@ -93,23 +201,4 @@ class Voyages(object):
         np.nan
 
         """
-        dx = row['$\Delta x$']
-        dy = row['$\Delta y$']
-
-        if dx == 0 and dy == 0:
-            # No movement --> Not a number
-            return np.nan
-        elif dx > 0 and dy > 0:
-            # Towards upper right --> bimodal
-            return r'$\nearrow$'
-        elif dx > 0 and dy <= 0:
-            # Towards lower right --> ~0
-            return r'$\searrow$'
-        elif dx <= 0 and dy > 0:
-            # Towards upper left --> ~1
-            return r'$\nwarrow$'
-        elif dx <= 0 and dy <= 0:
-            # Towards origin/lower left --> middle
-            return r'$\swarrow$'
-        else:
-            return np.nan
+        return direction_labels(row['$\Delta x$'], row['$\Delta y$'])